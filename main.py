@@ -4,21 +4,75 @@ Fetch hockey games from DDLC website and add them to Apple Calendar.
 """
 
 import asyncio
+import json
 import os
 import re
 import subprocess
+import threading
 from datetime import datetime, timedelta
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+import aiohttp
 from bs4 import BeautifulSoup
-from playwright.async_api import async_playwright
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
 from dotenv import load_dotenv
 
+try:
+    from EventKit import EKEventStore, EKEvent, EKEntityTypeEvent, EKSpanThisEvent
+    from Foundation import NSDate
+except ImportError:
+    EKEventStore = None
+
+
+ADDED_EVENTS_PATH = os.path.expanduser('~/.games-to-calendar/added.json')
+
+_ACCENT_MAP = str.maketrans('àâäéèêëîïôöùûüç', 'aaaeeeeiioouuuc')
+
+_FRENCH_MONTHS_ASCII = {
+    'janvier': 1, 'fevrier': 2, 'mars': 3, 'avril': 4,
+    'mai': 5, 'juin': 6, 'juillet': 7, 'aout': 8,
+    'septembre': 9, 'octobre': 10, 'novembre': 11, 'decembre': 12
+}
+
+_AS_ESCAPE = str.maketrans({'"': '\\"', '\\': '\\\\'})
+
+_AS_EVENT_RECORD = (
+    '{{evtTitle:"{title}", evtStart:date "{start}", evtEnd:date "{end}", '
+    'evtLocation:"{location}", evtNotes:"{notes}"}}'
+)
+
+# (lowercase venue substring, (calendar, title template)), checked in order.
+_VENUE_RULES = (
+    ('(st-aug', ('Dek St-Aug', 'game {cat}')),
+    ('(chauveau', ('Dek Chauveau', 'game {cat}')),
+    ('lévis', ('Autre', 'game {cat} Levis')),
+    ('levis', ('Autre', 'game {cat} Levis')),
+)
+
+
+def _format_applescript_date(dt):
+    """Format a datetime as 'MM/DD/YYYY hh:MM:SS AM' without going through strftime."""
+    hour = dt.hour % 12 or 12
+    am_pm = 'AM' if dt.hour < 12 else 'PM'
+    return f"{dt.month:02d}/{dt.day:02d}/{dt.year} {hour:02d}:{dt.minute:02d}:{dt.second:02d} {am_pm}"
+
+
+def _link_text(link):
+    """Stripped text of an anchor, read through .string when it holds a single text node."""
+    text = link.string
+    if text is not None:
+        return text.strip()
+    return link.get_text(strip=True)
+
 
 class DDLCGameFetcher:
-    FRENCH_MONTHS = {
-        'janvier': 1, 'février': 2, 'mars': 3, 'avril': 4,
-        'mai': 5, 'juin': 6, 'juillet': 7, 'août': 8,
-        'septembre': 9, 'octobre': 10, 'novembre': 11, 'décembre': 12
-    }
+    GAME_ROW_SELECTOR = 'table.schedule_table tr.schedule_container'
+
+    _DAY_MONTH_RE = re.compile(r'(\d+)\s+(\w+)')
+    _TIME_RE = re.compile(r'(\d+):(\d+)')
+    _EQUIPES_RE = re.compile(r'/equipes/')
+    _ISO_DATE_RE = re.compile(r'(\d{4}-\d{2}-\d{2})')
+    _HHMM_RE = re.compile(r'^(\d{1,2}):(\d{2})$')
+    _VENUE_PAREN_RE = re.compile(r'\s*\([^)]*\)')
 
     def __init__(self, url="https://www.ddlc.ca/ligues/calendrier/"):
         load_dotenv()
@@ -26,29 +80,32 @@ class DDLCGameFetcher:
         if not team_names_str:
             raise ValueError("TEAM_NAMES not found in .env file. Please configure your team names.")
         self.team_names = [name.strip() for name in team_names_str.split(',')]
+        self._team_set = frozenset(self.team_names)
+        self.list_view_query = os.getenv('LIST_VIEW_QUERY', '').strip()
         self.url = url
         self.games = []
+        self._now = None
 
-    def parse_french_date(self, date_str, time_str, year=None):
+    def parse_french_date(self, date_str, time_str, year=None, now=None):
         """Parse French date string like 'lundi, 15 décembre' and time like '18:00'."""
-        match = re.search(r'(\d+)\s+(\w+)', date_str)
+        match = self._DAY_MONTH_RE.search(date_str)
         if not match:
             return None
 
         day = int(match.group(1))
-        month_name = match.group(2).lower()
-        month = self.FRENCH_MONTHS.get(month_name)
+        month_name = match.group(2).lower().translate(_ACCENT_MAP)
+        month = _FRENCH_MONTHS_ASCII.get(month_name)
 
         if not month:
             return None
 
         if year is None:
-            current_date = datetime.now()
+            current_date = now or datetime.now()
             year = current_date.year
             if month < current_date.month or (month == current_date.month and day < current_date.day):
                 year += 1
 
-        time_match = re.search(r'(\d+):(\d+)', time_str)
+        time_match = self._TIME_RE.search(time_str)
         if not time_match:
             return None
 
@@ -61,35 +118,88 @@ class DDLCGameFetcher:
         except ValueError:
             return None
 
-    async def fetch_games(self):
-        """Fetch games from the DDLC website using Playwright."""
+    async def fetch_schedule_html_static(self):
+        """Fetch the list-view schedule HTML over plain HTTP, or None if the iframe cannot be found."""
+        timeout = aiohttp.ClientTimeout(total=30)
+        async with aiohttp.ClientSession(timeout=timeout) as session:
+            async with session.get(self.url) as response:
+                response.raise_for_status()
+                outer_html = await response.text()
+
+            # Match the iframe the browser would see: <noscript> content is not rendered.
+            outer_soup = BeautifulSoup(outer_html, 'lxml')
+            for noscript in outer_soup.find_all('noscript'):
+                noscript.decompose()
+            iframe_element = outer_soup.select_one('iframe[src]')
+            if not iframe_element:
+                return None
+
+            iframe_url = urljoin(self.url, iframe_element['src'])
+            print(f"Found calendar iframe: {iframe_url}")
+
+            # Keep the iframe's own parameters as-is and only replace the keys LIST_VIEW_QUERY sets.
+            parts = urlsplit(iframe_url)
+            list_view_params = parse_qsl(self.list_view_query, keep_blank_values=True)
+            overridden = {key for key, _ in list_view_params}
+            query = [(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+                     if key not in overridden]
+            query.extend(list_view_params)
+            list_url = urlunsplit(parts._replace(query=urlencode(query)))
+
+            async with session.get(list_url) as response:
+                response.raise_for_status()
+                return await response.text()
+
+    async def fetch_schedule_html_browser(self):
+        """Render the schedule with Playwright and return its HTML, or None on failure."""
         async with async_playwright() as p:
             browser = await p.chromium.launch(headless=True)
-            page = await browser.new_page()
+            context = await browser.new_context()
+            page = await context.new_page()
 
-            print(f"Loading {self.url}...")
-            await page.goto(self.url, wait_until="networkidle")
+            await page.goto(self.url, wait_until="domcontentloaded")
             await page.wait_for_selector("iframe", timeout=10000)
 
             iframe_element = await page.query_selector("iframe")
             if not iframe_element:
                 print("Error: No iframe found on the page")
                 await browser.close()
-                return self.games
+                return None
 
             iframe_url = await iframe_element.get_attribute("src")
             print(f"Found calendar iframe: {iframe_url}")
 
-            iframe_page = await browser.new_page()
-            await iframe_page.goto(iframe_url, wait_until="networkidle")
-            await asyncio.sleep(2)
+            iframe_page = await context.new_page()
+            await iframe_page.goto(iframe_url, wait_until="domcontentloaded")
+
+            try:
+                list_view_button = await iframe_page.wait_for_selector(
+                    'label.list_view[data-view="list"]', timeout=10000)
+            except PlaywrightTimeoutError:
+                list_view_button = None
 
             try:
-                list_view_button = await iframe_page.query_selector('label.list_view[data-view="list"]')
                 if list_view_button:
+                    # The default view may already list games, so wait for the row count to change
+                    # rather than for rows to exist.
+                    try:
+                        await iframe_page.wait_for_selector(self.GAME_ROW_SELECTOR, timeout=5000)
+                    except PlaywrightTimeoutError:
+                        pass
+                    rows_before = await iframe_page.eval_on_selector_all(
+                        self.GAME_ROW_SELECTOR, "rows => rows.length")
+
                     print("Switching to full calendar view...")
                     await list_view_button.click()
-                    await asyncio.sleep(5)
+                    try:
+                        await iframe_page.wait_for_function(
+                            "([selector, before]) => {"
+                            " const count = document.querySelectorAll(selector).length;"
+                            " return count > 0 && count !== before; }",
+                            arg=[self.GAME_ROW_SELECTOR, rows_before], timeout=15000)
+                    except PlaywrightTimeoutError:
+                        print("Warning: Schedule did not change after switching to full calendar view")
+                        print("Continuing with current view...")
                 else:
                     print("Warning: Could not find full calendar view button, using default view")
             except Exception as e:
@@ -97,228 +207,419 @@ class DDLCGameFetcher:
                 print("Continuing with default view...")
 
             content = await iframe_page.content()
-            soup = BeautifulSoup(content, 'html.parser')
-
-            current_date_str = None
-            schedule_table = soup.find('table', class_='schedule_table')
-
-            if not schedule_table:
-                print("Error: Could not find schedule table")
-                await iframe_page.close()
-                await browser.close()
-                return self.games
+            await context.close()
+            await browser.close()
 
-            all_rows = schedule_table.find_all('tr')
-            print(f"Processing {len(all_rows)} rows from schedule...\n")
+        return content
 
-            for row in all_rows:
-                date_header = row.find('h2')
-                if date_header:
-                    current_date_str = date_header.get_text(strip=True)
-                    continue
+    async def fetch_games(self):
+        """Fetch games from the DDLC website, over plain HTTP if LIST_VIEW_QUERY is set, else with Playwright."""
+        self._now = datetime.now()
+        print(f"Loading {self.url}...")
 
-                if 'schedule_container' not in row.get('class', []):
+        soup = None
+        if self.list_view_query:
+            try:
+                content = await self.fetch_schedule_html_static()
+            except (aiohttp.ClientError, asyncio.TimeoutError, UnicodeDecodeError) as e:
+                print(f"Warning: Could not fetch schedule over HTTP: {e}")
+                content = None
+
+            if content is not None:
+                soup = BeautifulSoup(content, 'lxml')
+                if not soup.select_one(self.GAME_ROW_SELECTOR):
+                    soup = None
+
+            if soup is None:
+                print("Could not load the schedule statically, falling back to Playwright...")
+
+        if soup is None:
+            content = await self.fetch_schedule_html_browser()
+            if content is None:
+                return self.games
+            soup = BeautifulSoup(content, 'lxml')
+
+        current_date_str = None
+        schedule_table = soup.find('table', class_='schedule_table')
+
+        if not schedule_table:
+            print("Error: Could not find schedule table")
+            return self.games
+
+        all_rows = schedule_table.select('tr:has(h2), tr.schedule_container')
+        print(f"Processing {len(all_rows)} date and game rows from schedule...\n")
+
+        for row in all_rows:
+            date_header = row.find('h2')
+            if date_header:
+                current_date_str = date_header.get_text(strip=True)
+                continue
+
+            team_links = row.find_all('a', href=self._EQUIPES_RE)
+            if len(team_links) < 2:
+                continue
+
+            all_teams = (_link_text(link) for link in team_links)
+            team_names = list(dict.fromkeys(t for t in all_teams if t))
+
+            if len(team_names) < 2:
+                print(f"  Skipped: Could not extract two team names from game row")
+                continue
+
+            away_team, home_team = team_names[0], team_names[1]
+            if away_team in self._team_set:
+                our_team, opponent, is_home = away_team, home_team, False
+            elif home_team in self._team_set:
+                our_team, opponent, is_home = home_team, away_team, True
+            else:
+                continue
+
+            cat_name_div = row.find('div', class_='cat_name')
+            category = "Hockey"
+            if cat_name_div:
+                cat_span = cat_name_div.find('span')
+                if cat_span:
+                    category_text = cat_span.get_text(strip=True)
+                    category = category_text.split()[0] if category_text else "Hockey"
+            else:
+                print(f"  Warning: Could not find category for game between {team_names[0]} and {team_names[1]}")
+                category = "Unknown"
+
+            td_elements = row.find_all('td')
+            game_datetime = None
+            venue = "TBD"
+
+            last_iso_date = None
+
+            for td in td_elements:
+                date_div = td.find('div', class_='game_date')
+                if not date_div:
                     continue
 
-                team_links = row.find_all('a', href=re.compile(r'/equipes/'))
-                if len(team_links) < 2:
+                date_text = date_div.get_text(strip=True)
+                date_match = self._ISO_DATE_RE.search(date_text)
+                if date_match:
+                    last_iso_date = date_match.group(1)
                     continue
 
-                all_teams = [link.get_text(strip=True) for link in team_links]
-                all_teams = [t for t in all_teams if t]
+                time_match = self._HHMM_RE.match(date_text)
+                if time_match:
+                    if last_iso_date:
+                        try:
+                            year, month, day = (int(part) for part in last_iso_date.split('-'))
+                            hour = int(time_match.group(1))
+                            minute = int(time_match.group(2))
+                            game_datetime = datetime(year, month, day, hour, minute)
+                        except ValueError as e:
+                            print(f"  Error: Could not parse date '{last_iso_date}' and time '{date_text}': {e}")
+
+                    venue_div = td.find('div', class_='game_venue')
+                    if venue_div:
+                        venue = venue_div.get_text(strip=True)
+                    break
+
+            if not game_datetime and current_date_str:
+                game_date_div = row.find('div', class_='game_date')
+                if game_date_div:
+                    time_str = game_date_div.get_text(strip=True)
+                    game_datetime = self.parse_french_date(current_date_str, time_str, now=self._now)
+
+                venue_div = row.find('div', class_='game_venue')
+                if venue_div:
+                    venue = venue_div.get_text(strip=True)
+
+            if not game_datetime:
+                print(f"  Skipped: Could not determine date/time for {our_team} game")
+                continue
+
+            if game_datetime < self._now:
+                continue
+
+            venue_lower = venue.lower()
+            for needle, (calendar, title_template) in _VENUE_RULES:
+                if needle in venue_lower:
+                    title = title_template.format(cat=category)
+                    break
+            else:
+                print(f"  Skipped: Unknown venue '{venue}' for {our_team} vs {opponent}")
+                continue
+
+            venue_name = self._VENUE_PAREN_RE.sub('', venue).strip()
+
+            if is_home:
+                notes = f"{opponent} @ {our_team}\n{venue_name}"
+            else:
+                notes = f"{our_team} @ {opponent}\n{venue_name}"
+
+            game = {
+                'title': title,
+                'start': game_datetime,
+                'end': game_datetime + timedelta(minutes=50),
+                'location': '',
+                'notes': notes,
+                'calendar': calendar,
+                'our_team': our_team,
+                'opponent': opponent,
+                'is_home': is_home
+            }
+
+            self.games.append(game)
+            print(f"  Found: {title} - {game_datetime.strftime('%Y-%m-%d %H:%M')}")
 
-                seen = set()
-                team_names = []
-                for team in all_teams:
-                    if team not in seen:
-                        seen.add(team)
-                        team_names.append(team)
+        return self.games
 
-                if len(team_names) < 2:
-                    print(f"  Skipped: Could not extract two team names from game row")
-                    continue
+    def build_existing_events_script(self, calendar_name, games):
+        """Build an AppleScript listing 'title<TAB>ISO start' for calendar events in the games' range."""
+        range_start = _format_applescript_date(min(game['start'] for game in games))
+        range_end = _format_applescript_date(max(game['end'] for game in games))
+
+        return f'''
+        on pad(n)
+            return text -2 thru -1 of ("0" & (n as integer))
+        end pad
+
+        set rangeStart to date "{range_start}"
+        set rangeEnd to date "{range_end}"
+        set output to {{}}
+        tell application "Calendar"
+            tell calendar "{calendar_name.translate(_AS_ESCAPE)}"
+                repeat with evt in (every event whose start date >= rangeStart and start date <= rangeEnd)
+                    set d to start date of evt
+                    set end of output to (summary of evt) & tab & (year of d as text) & "-" & my pad(month of d) & "-" & my pad(day of d) & "T" & my pad(hours of d) & ":" & my pad(minutes of d) & ":" & my pad(seconds of d)
+                end repeat
+            end tell
+        end tell
+        set AppleScript's text item delimiters to linefeed
+        return output as text
+        '''
+
+    def build_insert_script(self, calendar_name, games):
+        """Build one AppleScript that inserts every given game into a calendar."""
+        records = []
+        for game in games:
+            records.append(_AS_EVENT_RECORD.format(
+                title=game['title'].translate(_AS_ESCAPE),
+                start=_format_applescript_date(game['start']),
+                end=_format_applescript_date(game['end']),
+                location=game['location'].translate(_AS_ESCAPE),
+                notes=game['notes'].translate(_AS_ESCAPE),
+            ))
+
+        return f'''
+        set eventList to {{{", ".join(records)}}}
+        tell application "Calendar"
+            tell calendar "{calendar_name.translate(_AS_ESCAPE)}"
+                repeat with rec in eventList
+                    make new event with properties {{summary:evtTitle of rec, start date:evtStart of rec, end date:evtEnd of rec, location:evtLocation of rec, description:evtNotes of rec}}
+                end repeat
+            end tell
+        end tell
+        '''
 
-                our_team = None
-                opponent = None
-                is_home = False
+    @staticmethod
+    def event_key(game):
+        """Key identifying an event in the added-events cache."""
+        return game['calendar'], game['title'], game['start'].isoformat()
 
-                for i, team in enumerate(team_names):
-                    if team in self.team_names:
-                        our_team = team
-                        opponent = team_names[1 - i]
-                        is_home = i == 1
-                        break
+    def load_added_events(self, now):
+        """Load the keys of upcoming events added by previous runs, and whether past ones were dropped."""
+        try:
+            with open(ADDED_EVENTS_PATH) as f:
+                keys = {tuple(key) for key in json.load(f)}
+            upcoming = {key for key in keys if datetime.fromisoformat(key[2]) >= now}
+        except FileNotFoundError:
+            return set(), False
+        except (OSError, ValueError, TypeError, IndexError) as e:
+            print(f"  Warning: Could not read {ADDED_EVENTS_PATH}, ignoring it: {e}")
+            return set(), False
+        return upcoming, len(upcoming) != len(keys)
+
+    def save_added_events(self, added_keys):
+        """Persist the keys of events added so far."""
+        try:
+            os.makedirs(os.path.dirname(ADDED_EVENTS_PATH), exist_ok=True)
+            with open(ADDED_EVENTS_PATH, 'w') as f:
+                json.dump(sorted(added_keys), f, indent=2)
+        except OSError as e:
+            print(f"  Warning: Could not write {ADDED_EVENTS_PATH}: {e}")
+
+    def request_eventkit_access(self, store):
+        """Ask for calendar access and wait for the user's answer."""
+        answered = threading.Event()
+        access = {'granted': False}
+
+        def completion(granted, error):
+            access['granted'] = bool(granted)
+            answered.set()
+
+        if hasattr(store, 'requestFullAccessToEventsWithCompletion_'):
+            store.requestFullAccessToEventsWithCompletion_(completion)
+        else:
+            store.requestAccessToEntityType_completion_(EKEntityTypeEvent, completion)
+
+        answered.wait(timeout=60)
+        return access['granted']
+
+    def add_with_eventkit(self, games_by_calendar):
+        """Add games through EventKit and return (added games, skipped count), or None without access."""
+        store = EKEventStore.alloc().init()
+        if not self.request_eventkit_access(store):
+            print("  Warning: Calendar access denied to EventKit, falling back to AppleScript")
+            return None
 
-                if not our_team:
-                    continue
+        # Keep the first calendar with a given title, like AppleScript's calendar "X" does.
+        calendars = {}
+        for cal in store.calendarsForEntityType_(EKEntityTypeEvent):
+            calendars.setdefault(cal.title(), cal)
 
-                cat_name_div = row.find('div', class_='cat_name')
-                category = "Hockey"
-                if cat_name_div:
-                    cat_span = cat_name_div.find('span')
-                    if cat_span:
-                        category_text = cat_span.get_text(strip=True)
-                        category = category_text.split()[0] if category_text else "Hockey"
-                else:
-                    print(f"  Warning: Could not find category for game between {team_names[0]} and {team_names[1]}")
-                    category = "Unknown"
-
-                td_elements = row.find_all('td')
-                game_datetime = None
-                venue = "TBD"
-
-                for td in td_elements:
-                    date_div = td.find('div', class_='game_date')
-                    if date_div:
-                        date_text = date_div.get_text(strip=True)
-                        if re.search(r'\d{4}-\d{2}-\d{2}', date_text):
-                            continue
-                        elif re.match(r'^\d{1,2}:\d{2}$', date_text):
-                            time_str = date_text
-                            for prev_td in td_elements:
-                                prev_date_div = prev_td.find('div', class_='game_date')
-                                if prev_date_div:
-                                    prev_text = prev_date_div.get_text(strip=True)
-                                    date_match = re.search(r'(\d{4}-\d{2}-\d{2})', prev_text)
-                                    if date_match:
-                                        date_str = date_match.group(1)
-                                        try:
-                                            date_parts = date_str.split('-')
-                                            year = int(date_parts[0])
-                                            month = int(date_parts[1])
-                                            day = int(date_parts[2])
-
-                                            time_match = re.match(r'(\d{1,2}):(\d{2})', time_str)
-                                            if time_match:
-                                                hour = int(time_match.group(1))
-                                                minute = int(time_match.group(2))
-                                                game_datetime = datetime(year, month, day, hour, minute)
-                                        except (ValueError, IndexError) as e:
-                                            print(f"  Error: Could not parse date '{date_str}' and time '{time_str}': {e}")
-                                        break
-
-                            venue_div = td.find('div', class_='game_venue')
-                            if venue_div:
-                                venue = venue_div.get_text(strip=True)
-                            break
-
-                if not game_datetime and current_date_str:
-                    game_date_div = row.find('div', class_='game_date')
-                    if game_date_div:
-                        time_str = game_date_div.get_text(strip=True)
-                        game_datetime = self.parse_french_date(current_date_str, time_str)
-
-                    venue_div = row.find('div', class_='game_venue')
-                    if venue_div:
-                        venue = venue_div.get_text(strip=True)
+        staged_games = []
+        skipped_count = 0
 
-                if not game_datetime:
-                    print(f"  Skipped: Could not determine date/time for {our_team} game")
+        for calendar_name, games in games_by_calendar.items():
+            calendar = calendars.get(calendar_name)
+            if calendar is None:
+                print(f"  Error adding {len(games)} games to '{calendar_name}'")
+                print(f"  Make sure calendar '{calendar_name}' exists in Apple Calendar")
+                continue
+
+            predicate = store.predicateForEventsWithStartDate_endDate_calendars_(
+                NSDate.dateWithTimeIntervalSince1970_(min(game['start'] for game in games).timestamp()),
+                NSDate.dateWithTimeIntervalSince1970_(max(game['end'] for game in games).timestamp()),
+                [calendar])
+            existing = {
+                (evt.title(), evt.startDate().timeIntervalSince1970())
+                for evt in store.eventsMatchingPredicate_(predicate) or []
+            }
+
+            for game in games:
+                start_ts = game['start'].timestamp()
+                start_date = NSDate.dateWithTimeIntervalSince1970_(start_ts)
+                end_date = NSDate.dateWithTimeIntervalSince1970_(game['end'].timestamp())
+
+                if (game['title'], start_ts) in existing:
+                    print(f"  Skipped: {game['title']} - {game['start'].strftime('%Y-%m-%d %H:%M')}")
+                    skipped_count += 1
                     continue
 
-                if game_datetime < datetime.now():
+                event = EKEvent.eventWithEventStore_(store)
+                event.setTitle_(game['title'])
+                event.setStartDate_(start_date)
+                event.setEndDate_(end_date)
+                event.setLocation_(game['location'])
+                event.setNotes_(game['notes'])
+                event.setCalendar_(calendar)
+
+                saved, error = store.saveEvent_span_commit_error_(event, EKSpanThisEvent, False, None)
+                if not saved:
+                    print(f"  Error adding {game['title']}: {error}")
                     continue
 
-                if "(St-Aug" in venue or "(st-aug" in venue.lower():
-                    calendar = "Dek St-Aug"
-                    title = f"game {category}"
-                elif "(Chauveau" in venue or "(chauveau" in venue.lower():
-                    calendar = "Dek Chauveau"
-                    title = f"game {category}"
-                elif "lévis" in venue.lower() or "levis" in venue.lower():
-                    calendar = "Autre"
-                    title = f"game {category} Levis"
-                else:
-                    print(f"  Skipped: Unknown venue '{venue}' for {our_team} vs {opponent}")
-                    continue
+                existing.add((game['title'], start_ts))
+                staged_games.append(game)
+
+        committed, error = store.commit_(None)
+        if not committed:
+            print(f"  Error saving {len(staged_games)} events to Apple Calendar: {error}")
+            return [], skipped_count
+
+        for game in staged_games:
+            print(f"  Added: {game['title']} - {game['start'].strftime('%Y-%m-%d %H:%M')}")
+
+        return staged_games, skipped_count
+
+    async def run_osascript(self, script):
+        """Run an AppleScript through osascript and return its output."""
+        proc = await asyncio.create_subprocess_exec(
+            "osascript", "-",
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        stdout, stderr = await proc.communicate(script.encode())
+        if proc.returncode != 0:
+            raise subprocess.CalledProcessError(proc.returncode, ["osascript", "-"], stdout, stderr)
+        return stdout.decode()
+
+    async def sync_calendar_applescript(self, calendar_name, games):
+        """Insert the games missing from one calendar; returns the indexes of games already there."""
+        output = await self.run_osascript(self.build_existing_events_script(calendar_name, games))
+        existing = set()
+        for line in output.splitlines():
+            title, _, start_iso = line.rpartition('\t')
+            existing.add((title, start_iso))
+
+        # Track inserted keys too, so a game listed twice is only inserted once.
+        skipped = set()
+        missing = []
+        for i, game in enumerate(games):
+            key = (game['title'], game['start'].isoformat())
+            if key in existing:
+                skipped.add(i)
+            else:
+                existing.add(key)
+                missing.append(game)
+
+        if missing:
+            await self.run_osascript(self.build_insert_script(calendar_name, missing))
+        return skipped
+
+    async def add_with_applescript(self, games_by_calendar):
+        """Add games with concurrent AppleScript runs per calendar; returns (added games, skipped count)."""
+        added_games = []
+        skipped_count = 0
 
-                venue_name = re.sub(r'\s*\([^)]*\)', '', venue).strip()
+        results = await asyncio.gather(
+            *(self.sync_calendar_applescript(calendar_name, games)
+              for calendar_name, games in games_by_calendar.items()),
+            return_exceptions=True,
+        )
+
+        for (calendar_name, games), result in zip(games_by_calendar.items(), results):
+            if isinstance(result, Exception):
+                print(f"  Error adding {len(games)} games to '{calendar_name}': {result}")
+                print(f"  Make sure calendar '{calendar_name}' exists in Apple Calendar")
+                continue
 
-                if is_home:
-                    notes = f"{opponent} @ {our_team}\n{venue_name}"
+            for i, game in enumerate(games):
+                if i in result:
+                    print(f"  Skipped: {game['title']} - {game['start'].strftime('%Y-%m-%d %H:%M')}")
+                    skipped_count += 1
                 else:
-                    notes = f"{our_team} @ {opponent}\n{venue_name}"
-
-                game = {
-                    'title': title,
-                    'start': game_datetime,
-                    'end': game_datetime + timedelta(minutes=50),
-                    'location': '',
-                    'notes': notes,
-                    'calendar': calendar,
-                    'our_team': our_team,
-                    'opponent': opponent,
-                    'is_home': is_home
-                }
-
-                self.games.append(game)
-                print(f"  Found: {title} - {game_datetime.strftime('%Y-%m-%d %H:%M')}")
-
-            await iframe_page.close()
-            await browser.close()
+                    print(f"  Added: {game['title']} - {game['start'].strftime('%Y-%m-%d %H:%M')}")
+                    added_games.append(game)
 
-        return self.games
+        return added_games, skipped_count
 
-    def add_to_calendar(self):
-        """Add games to Apple Calendar using AppleScript."""
+    async def add_to_calendar(self):
+        """Add games to Apple Calendar, through EventKit when PyObjC is available."""
         if not self.games:
             return
 
-        added_count = 0
-        skipped_count = 0
+        added_keys, pruned = self.load_added_events(datetime.now())
+        cached_count = 0
 
+        games_by_calendar = {}
         for game in self.games:
-            start_str = game['start'].strftime('%m/%d/%Y %I:%M:%S %p')
-            end_str = game['end'].strftime('%m/%d/%Y %I:%M:%S %p')
-            calendar_name = game['calendar']
-
-            check_script = f'''
-            tell application "Calendar"
-                tell calendar "{calendar_name}"
-                    set eventExists to false
-                    set checkDate to date "{start_str}"
-                    repeat with evt in (every event whose start date is checkDate)
-                        if summary of evt is "{game['title']}" then
-                            set eventExists to true
-                            exit repeat
-                        end if
-                    end repeat
-                    return eventExists
-                end tell
-            end tell
-            '''
-
-            try:
-                result = subprocess.run(["osascript", "-e", check_script],
-                                      check=True, capture_output=True, text=True)
-                exists = result.stdout.strip() == "true"
-
-                if exists:
-                    print(f"  Skipped: {game['title']} - {game['start'].strftime('%Y-%m-%d %H:%M')}")
-                    skipped_count += 1
-                    continue
-            except subprocess.CalledProcessError as e:
-                print(f"  Warning: Could not check if event exists for {game['title']}: {e}")
-                print(f"  Attempting to add anyway...")
-                pass
-
-            add_script = f'''
-            tell application "Calendar"
-                tell calendar "{calendar_name}"
-                    make new event with properties {{summary:"{game['title']}", start date:date "{start_str}", end date:date "{end_str}", location:"{game['location']}", description:"{game['notes']}"}}
-                end tell
-            end tell
-            '''
-
-            try:
-                subprocess.run(["osascript", "-e", add_script], check=True, capture_output=True)
-                print(f"  Added: {game['title']} - {game['start'].strftime('%Y-%m-%d %H:%M')}")
-                added_count += 1
-            except subprocess.CalledProcessError as e:
-                print(f"  Error adding {game['title']}: {e}")
-                print(f"  Make sure calendar '{calendar_name}' exists in Apple Calendar")
-
-        print(f"\nAdded {added_count} games, skipped {skipped_count} duplicates")
+            if self.event_key(game) in added_keys:
+                print(f"  Skipped (added by a previous run): {game['title']} - {game['start'].strftime('%Y-%m-%d %H:%M')}")
+                cached_count += 1
+                continue
+            games_by_calendar.setdefault(game['calendar'], []).append(game)
+
+        result = None
+        if not games_by_calendar:
+            result = [], 0
+        elif EKEventStore is not None:
+            result = self.add_with_eventkit(games_by_calendar)
+        if result is None:
+            result = await self.add_with_applescript(games_by_calendar)
+
+        added_games, skipped_count = result
+        if added_games or pruned:
+            added_keys.update(self.event_key(game) for game in added_games)
+            self.save_added_events(added_keys)
+
+        print(f"\nAdded {len(added_games)} games, skipped {skipped_count} found in calendar")
+        if cached_count:
+            print(f"Skipped {cached_count} games already added by a previous run "
+                  f"(delete {ADDED_EVENTS_PATH} to check them against the calendar again)")
 
 
 async def main():
@@ -334,7 +635,7 @@ async def main():
         print(f"Found {len(games)} games for your teams")
         print(f"{'='*60}\n")
         print("Adding games to your calendars...\n")
-        fetcher.add_to_calendar()
+        await fetcher.add_to_calendar()
         print("\nDone!")
     else:
         print("\nNo games found for your teams.")